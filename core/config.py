@@ -189,6 +189,15 @@ IGNORE_SYSTEM_DIRS = {
 # and prevents the "directory appears messy but has no files" issue
 RECURSIVE_SCAN = False
 
+# Persist scan results between runs and reuse them while the directory is unchanged
+ENABLE_SCAN_CACHE = True
+
+# Scan cache location
+SCAN_CACHE_FILE = Path.home() / ".cache" / "file-archiver" / "scan_cache.json"
+
+# Maximum number of directories kept in the scan cache (least recently used are dropped)
+SCAN_CACHE_MAX_ENTRIES = 5000
+
 # ================================
 # Duplicate Detection
 # ================================
@@ -197,7 +206,14 @@ RECURSIVE_SCAN = False
 ENABLE_DUPLICATE_DETECTION = True
 
 # Hash algorithm for duplicate detection
-HASH_ALGORITHM = "sha256"  # Options: md5, sha1, sha256
+# Hashes are only compared for duplicate detection, so a fast non-SHA-2
+# algorithm is fine. blake3 is the fastest and falls back to blake2b if
+# the optional blake3 package is not installed
+HASH_ALGORITHM = "blake3"  # Options: md5, sha1, sha256, blake2b, blake3
+
+# Same-sized files are first compared by a hash of this many leading bytes,
+# and only hashed in full if those match
+DUPLICATE_HEAD_BYTES = 64 * 1024  # 64 KiB
 
 # Minimum file size for duplicate checking (in bytes)
 # Files smaller than this will be compared by content directly
@@ -335,7 +351,7 @@ def validate_config() -> bool:
     if DEFAULT_COLLISION_POLICY not in ["suffix", "hash", "skip", "overwrite"]:
         raise ValueError(f"Invalid collision policy: {DEFAULT_COLLISION_POLICY}")
 
-    if HASH_ALGORITHM not in ["md5", "sha1", "sha256"]:
+    if HASH_ALGORITHM not in ["md5", "sha1", "sha256", "blake2b", "blake3"]:
         raise ValueError(f"Invalid hash algorithm: {HASH_ALGORITHM}")
 
     return True
@@ -6,7 +6,7 @@ Contains dataclasses and types used throughout the application.
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import Dict, FrozenSet, List, Optional
 from enum import Enum
 
 
@@ -92,18 +92,25 @@ class DirectoryScore:
     file_types: int
     total_size: int
     score: float
-    extensions: Set[str] = field(default_factory=set)
+    extensions: FrozenSet[str] = field(default_factory=frozenset)
     recursive: bool = False  # Whether this score includes subdirectories
+    truncated: bool = False  # Scan stopped early; totals are lower bounds
+
+    @property
+    def files_formatted(self) -> str:
+        """Get file count, marked with '+' if the scan stopped early."""
+        return f"{self.total_files}+" if self.truncated else str(self.total_files)
 
     @property
     def size_formatted(self) -> str:
-        """Get human-readable total size."""
+        """Get human-readable total size, marked with '+' if the scan stopped early."""
         if self.total_size < 1024 * 1024:
-            return f"{self.total_size / 1024:.1f} KB"
+            size = f"{self.total_size / 1024:.1f} KB"
         elif self.total_size < 1024 * 1024 * 1024:
-            return f"{self.total_size / (1024 * 1024):.1f} MB"
+            size = f"{self.total_size / (1024 * 1024):.1f} MB"
         else:
-            return f"{self.total_size / (1024 * 1024 * 1024):.1f} GB"
+            size = f"{self.total_size / (1024 * 1024 * 1024):.1f} GB"
+        return f"{size}+" if self.truncated else size
 
     def __repr__(self) -> str:
         return (
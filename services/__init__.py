@@ -4,6 +4,7 @@ Contains business logic services.
 """
 
 from .scanner import DirectoryScanner
+from .scan_cache import ScanCache
 from .classifier import FileClassifier
 from .content_analyzer import ContentAnalyzer
 from .mover import FileMover
@@ -11,6 +12,7 @@ from .reporter import Reporter
 
 __all__ = [
     "DirectoryScanner",
+    "ScanCache",
     "FileClassifier",
     "ContentAnalyzer",
     "FileMover",
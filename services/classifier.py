@@ -4,12 +4,20 @@ Classifies files into categories based on extension and content.
 """
 
 import logging
+import os
+from collections import defaultdict
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional
 
 from ..core import FileInfo, FileStatus
-from ..core.config import get_category_for_extension
-from ..utils import get_file_extension, get_file_size, get_file_hash, is_hidden_file
+from ..core.config import DUPLICATE_HEAD_BYTES, HASH_ALGORITHM, get_category_for_extension
+from ..utils import (
+    get_file_digests,
+    get_file_extension,
+    get_file_size,
+    get_file_size_from_entry,
+    is_hidden_file,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -24,16 +32,17 @@ class FileClassifier:
         Initialize the classifier.
 
         Args:
-            enable_hashing: Whether to calculate file hashes
+            enable_hashing: Whether to hash files to find duplicates
         """
         self.enable_hashing = enable_hashing
 
-    def classify_file(self, file_path: Path) -> FileInfo:
+    def classify_file(self, file_path: Path, size: Optional[int] = None) -> FileInfo:
         """
         Classify a single file.
 
         Args:
             file_path: Path to the file
+            size: File size in bytes, if already known (avoids a stat)
 
         Returns:
             FileInfo object
@@ -41,27 +50,25 @@ class FileClassifier:
         try:
             extension = get_file_extension(file_path)
             category = get_category_for_extension(extension)
-            size = get_file_size(file_path)
-
-            file_hash = None
-            if self.enable_hashing:
-                file_hash = get_file_hash(file_path)
+            if size is None:
+                size = get_file_size(file_path)
 
+            # Hashes are computed lazily by find_duplicates, only for files
+            # that could be duplicates
             file_info = FileInfo(
                 path=file_path,
                 size=size,
                 extension=extension,
                 category=category,
-                hash=file_hash,
                 status=FileStatus.PENDING,
             )
 
-            logger.debug(f"Classified {file_path.name} as {category}")
+            logger.debug("Classified %s as %s", file_path.name, category)
 
             return file_info
 
         except Exception as e:
-            logger.error(f"Error classifying file {file_path}: {e}")
+            logger.error("Error classifying file %s: %s", file_path, e)
             return FileInfo(
                 path=file_path,
                 size=0,
@@ -107,6 +114,42 @@ class FileClassifier:
 
         return files
 
+    def classify_entries(self, entries: Iterable[os.DirEntry]) -> List[FileInfo]:
+        """
+        Classify files from an existing directory walk.
+
+        Accepts the entries yielded by DirectoryScanner.iter_entries(), so a
+        directory that was already walked for scoring is not read again.
+        Sizes come from the entries' cached stat results.
+
+        Args:
+            entries: File entries to classify
+
+        Returns:
+            List of FileInfo objects
+        """
+        files = list(self.iter_classify_entries(entries))
+
+        logger.info("Classified %d files", len(files))
+
+        return files
+
+    def iter_classify_entries(self, entries: Iterable[os.DirEntry]) -> Iterator[FileInfo]:
+        """
+        Lazily classify files from a directory walk.
+
+        Each entry is classified as it is pulled, so callers can report
+        progress or stop early without waiting for the whole walk.
+
+        Args:
+            entries: File entries to classify
+
+        Yields:
+            FileInfo objects
+        """
+        for entry in entries:
+            yield self.classify_file(Path(entry.path), size=get_file_size_from_entry(entry))
+
     def classify_multiple_directories(self, directories: List[Path]) -> List[FileInfo]:
         """
         Classify files from multiple directories.
@@ -124,17 +167,22 @@ class FileClassifier:
             all_files.extend(files)
 
         logger.info(
-            f"Classified {len(all_files)} files from " f"{len(directories)} directories"
+            "Classified %d files from %d directories", len(all_files), len(directories)
         )
 
         return all_files
 
-    def find_duplicates(self, files: List[FileInfo]) -> List[tuple[FileInfo, FileInfo]]:
+    def find_duplicates(self, files: Iterable[FileInfo]) -> List[tuple[FileInfo, FileInfo]]:
         """
         Find duplicate files based on hash.
 
+        Files can only be duplicates if their sizes match, so files are
+        bucketed by size first. Within a bucket, the first 64 KiB are hashed
+        as a cheap discriminator, and only files whose heads match are hashed
+        in full. Full hashes are stored on the FileInfo objects.
+
         Args:
-            files: List of FileInfo objects with hashes
+            files: FileInfo objects; any iterable, consumed in a single pass
 
         Returns:
             List of tuples containing duplicate pairs
@@ -145,19 +193,59 @@ class FileClassifier:
 
         logger.info("Searching for duplicates...")
 
-        # Group files by hash
-        hash_map: dict[str, List[FileInfo]] = {}
+        # Group files by size
+        size_map: dict[int, List[FileInfo]] = defaultdict(list)
 
         for file in files:
-            if file.hash:
-                if file.hash not in hash_map:
-                    hash_map[file.hash] = []
-                hash_map[file.hash].append(file)
+            if file.status != FileStatus.ERROR:
+                size_map[file.size].append(file)
+
+        # Group same-sized files by digest. Raw digests are compared rather
+        # than hex strings, which are twice the size
+        digest_map: dict[bytes, List[FileInfo]] = defaultdict(list)
+
+        # Hash the heads of all same-sized files at once, in parallel
+        candidates = [
+            file for size_group in size_map.values() if len(size_group) > 1
+            for file in size_group
+        ]
+        head_digests = get_file_digests(
+            [file.path for file in candidates], HASH_ALGORITHM,
+            max_bytes=DUPLICATE_HEAD_BYTES
+        )
+
+        head_map: dict[tuple[int, bytes], List[FileInfo]] = defaultdict(list)
+        for file, head_digest in zip(candidates, head_digests):
+            if head_digest is not None:
+                head_map[(file.size, head_digest)].append(file)
+
+        # Only files whose heads match need a full hash
+        to_hash: List[FileInfo] = []
+        for (size, head_digest), head_group in head_map.items():
+            if len(head_group) < 2:
+                continue
+
+            if size <= DUPLICATE_HEAD_BYTES:
+                # The head digest already covers small files entirely
+                digest_map[head_digest].extend(head_group)
+            else:
+                to_hash.extend(head_group)
+
+        full_digests = get_file_digests([file.path for file in to_hash], HASH_ALGORITHM)
+        for file, digest in zip(to_hash, full_digests):
+            if digest is not None:
+                digest_map[digest].append(file)
+
+        # Hex hashes are only stored on the files, for display
+        for digest, file_group in digest_map.items():
+            file_hash = digest.hex()
+            for file in file_group:
+                file.hash = file_hash
 
         # Find groups with more than one file (duplicates)
         duplicates: List[tuple[FileInfo, FileInfo]] = []
 
-        for file_hash, file_group in hash_map.items():
+        for file_group in digest_map.values():
             if len(file_group) > 1:
                 # Create pairs of duplicates
                 for i in range(len(file_group) - 1):
@@ -6,7 +6,7 @@ Handles file moving operations with collision detection and handling.
 import logging
 import shutil
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterable, List, Optional
 from datetime import datetime
 
 from ..core import FileInfo, FileStatus, CollisionPolicy, ArchiveSession, ArchivePlan, CATEGORY_DISPLAY_NAMES
@@ -15,11 +15,13 @@ from ..core.config import (
     SESSION_PREFIX,
     DEFAULT_COLLISION_POLICY,
     COLLISION_SUFFIX_FORMAT,
+    HASH_ALGORITHM,
 )
 from ..utils import (
     create_directory_safe,
     ensure_unique_path,
     format_timestamp,
+    get_file_hash,
 )
 
 logger = logging.getLogger(__name__)
@@ -51,7 +53,7 @@ class FileMover:
     def create_session(
         self,
         source_directories: List[Path],
-        files: List[FileInfo],
+        files: Iterable[FileInfo],
         dry_run: bool = True,
     ) -> ArchiveSession:
         """
@@ -59,7 +61,7 @@ class FileMover:
 
         Args:
             source_directories: List of source directories
-            files: List of files to archive
+            files: Files to archive; any iterable, e.g. a classifier stream
             dry_run: Whether this is a dry run
 
         Returns:
@@ -89,7 +91,7 @@ class FileMover:
             timestamp=timestamp,
             source_directories=source_directories,
             archive_path=session_path,
-            files=files,
+            files=files if isinstance(files, list) else list(files),
             dry_run=dry_run,
         )
 
@@ -136,7 +138,7 @@ class FileMover:
                     plan.add_operation("move", file_info)
 
             except Exception as e:
-                logger.error(f"Error planning for {file_info.path}: {e}")
+                logger.error("Error planning for %s: %s", file_info.path, e)
                 file_info.status = FileStatus.ERROR
                 file_info.error = str(e)
                 plan.add_warning(f"Error planning {file_info.name}: {e}")
@@ -175,7 +177,7 @@ class FileMover:
                 self._move_file(file_info, session.archive_path)
 
             except Exception as e:
-                logger.error(f"Error moving {file_info.path}: {e}")
+                logger.error("Error moving %s: %s", file_info.path, e)
                 file_info.status = FileStatus.ERROR
                 file_info.error = str(e)
 
@@ -233,7 +235,7 @@ class FileMover:
         try:
             shutil.move(str(file_info.path), str(destination))
             file_info.status = FileStatus.MOVED
-            logger.debug(f"Moved: {file_info.name} -> {destination}")
+            logger.debug("Moved: %s -> %s", file_info.name, destination)
 
         except Exception as e:
             file_info.status = FileStatus.ERROR
@@ -251,15 +253,15 @@ class FileMover:
         Returns:
             Final destination path
         """
-        logger.warning(f"Collision detected for {file_info.name}")
+        logger.warning("Collision detected for %s", file_info.name)
 
         if self.collision_policy == CollisionPolicy.SKIP:
             file_info.status = FileStatus.SKIPPED
-            logger.info(f"Skipped (collision): {file_info.name}")
+            logger.info("Skipped (collision): %s", file_info.name)
             return destination
 
         elif self.collision_policy == CollisionPolicy.OVERWRITE:
-            logger.info(f"Will overwrite: {destination}")
+            logger.info("Will overwrite: %s", destination)
             return destination
 
         elif self.collision_policy == CollisionPolicy.SUFFIX:
@@ -274,13 +276,15 @@ class FileMover:
                 new_destination = parent / new_name
 
                 if not new_destination.exists():
-                    logger.info(f"Renamed to: {new_name}")
+                    logger.info("Renamed to: %s", new_name)
                     return new_destination
 
                 counter += 1
 
         elif self.collision_policy == CollisionPolicy.HASH:
-            # Add hash suffix
+            # Add hash suffix (hashes are only precomputed for duplicate candidates)
+            if not file_info.hash:
+                file_info.hash = get_file_hash(file_info.path, HASH_ALGORITHM)
             if file_info.hash:
                 hash_suffix = file_info.hash[:8]
                 stem = destination.stem
@@ -290,7 +294,7 @@ class FileMover:
                 new_name = f"{stem}_{hash_suffix}{suffix}"
                 new_destination = parent / new_name
 
-                logger.info(f"Renamed with hash: {new_name}")
+                logger.info("Renamed with hash: %s", new_name)
                 return new_destination
             else:
                 # Fallback to suffix if no hash
@@ -329,10 +333,10 @@ class FileMover:
                 # Move file back to original location
                 shutil.move(str(file_info.destination), str(file_info.path))
                 success_count += 1
-                logger.debug(f"Rolled back: {file_info.name}")
+                logger.debug("Rolled back: %s", file_info.name)
 
             except Exception as e:
-                logger.error(f"Error rolling back {file_info.name}: {e}")
+                logger.error("Error rolling back %s: %s", file_info.name, e)
 
         logger.info(f"Rollback complete: {success_count} files restored")
 
@@ -0,0 +1,159 @@
+"""
+Scan cache service.
+Persists directory scan results between runs so unchanged directories are not rescanned.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from ..core.config import SCAN_CACHE_FILE, SCAN_CACHE_MAX_ENTRIES
+
+logger = logging.getLogger(__name__)
+
+
+class ScanCache:
+    """
+    JSON-backed cache of directory scan results.
+
+    Entries are keyed by resolved path, recursive flag and the scanner's
+    filter settings, and are only returned while the directory's mtime
+    (and, for recursive scans, the mtimes of its immediate subdirectories)
+    is unchanged. Only the most recently used entries are kept.
+    """
+
+    def __init__(self, cache_file: Path = SCAN_CACHE_FILE,
+                 max_entries: int = SCAN_CACHE_MAX_ENTRIES):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_file: JSON file used to persist entries
+            max_entries: Maximum number of entries kept on disk
+        """
+        self.cache_file = cache_file
+        self.max_entries = max_entries
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._dirty = False
+
+    def get(self, directory: Path, mtime_ns: int, recursive: bool,
+            variant: str = "") -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached scan result.
+
+        Args:
+            directory: Scanned directory
+            mtime_ns: Current mtime of the directory in nanoseconds
+            recursive: Whether the scan is recursive
+            variant: Fingerprint of the scanner settings that shape the result
+
+        Returns:
+            Cached entry, or None if missing or stale
+        """
+        entries = self._load()
+        key = self._key(directory, recursive, variant)
+        entry = entries.get(key)
+        if entry is None or entry.get("mtime_ns") != mtime_ns:
+            return None
+
+        if recursive and entry.get("subdirs") != self._subdir_signature(directory):
+            return None
+
+        # Mark as recently used so pruning keeps it; the new order has to be
+        # saved too, or a run with only hits would forget it
+        entries[key] = entries.pop(key)
+        self._dirty = True
+        return entry
+
+    def put(self, directory: Path, mtime_ns: int, recursive: bool,
+            total_files: int, total_size: int, extensions,
+            variant: str = "") -> None:
+        """
+        Store a scan result in memory. Call save() to persist it.
+
+        Args:
+            directory: Scanned directory
+            mtime_ns: Mtime of the directory in nanoseconds at scan time
+            recursive: Whether the scan was recursive
+            total_files: Number of files found
+            total_size: Total size of files in bytes
+            extensions: Distinct extensions found
+            variant: Fingerprint of the scanner settings that shape the result
+        """
+        entries = self._load()
+        key = self._key(directory, recursive, variant)
+        # Re-inserted at the end, so entries stay ordered by last use
+        entries.pop(key, None)
+        entries[key] = {
+            "mtime_ns": mtime_ns,
+            "subdirs": self._subdir_signature(directory) if recursive else None,
+            "total_files": total_files,
+            "total_size": total_size,
+            "extensions": sorted(extensions),
+        }
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write pending entries to disk."""
+        if not self._dirty:
+            return
+
+        # Drop the least recently used entries beyond the limit
+        excess = len(self._entries) - self.max_entries
+        if excess > 0:
+            for key in list(self._entries)[:excess]:
+                del self._entries[key]
+
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.cache_file.with_suffix(".tmp")
+            tmp_file.write_text(json.dumps(self._entries), encoding="utf-8")
+            os.replace(tmp_file, self.cache_file)
+            self._dirty = False
+        except Exception as e:
+            logger.warning("Could not save scan cache %s: %s", self.cache_file, e)
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        self._entries = {}
+        self._dirty = True
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Load entries from disk on first use."""
+        if self._entries is None:
+            try:
+                self._entries = json.loads(self.cache_file.read_text(encoding="utf-8"))
+            except FileNotFoundError:
+                self._entries = {}
+            except Exception as e:
+                logger.warning("Ignoring unreadable scan cache %s: %s", self.cache_file, e)
+                self._entries = {}
+        return self._entries
+
+    @staticmethod
+    def _key(directory: Path, recursive: bool, variant: str) -> str:
+        """Build the cache key for a directory."""
+        return f"{directory.resolve()}|{int(recursive)}|{variant}"
+
+    @staticmethod
+    def _subdir_signature(directory: Path) -> Optional[str]:
+        """
+        Fingerprint the immediate subdirectories of a directory.
+
+        Costs one directory read but no recursion, so changes inside
+        subdirectories invalidate recursive entries cheaply.
+        """
+        try:
+            with os.scandir(directory) as it:
+                subdirs = sorted(
+                    (entry.name, entry.stat().st_mtime_ns)
+                    for entry in it
+                    if entry.is_dir(follow_symlinks=False)
+                )
+        except OSError:
+            return None
+
+        return hashlib.sha1(repr(subdirs).encode("utf-8")).hexdigest()
@@ -4,10 +4,14 @@ Directory scanner service.
 Scans directories and provides recommendations for archiving.
 """
 
+import hashlib
+import heapq
 import logging
+import os
 import re
+import stat
 from pathlib import Path
-from typing import List, Set
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Set
 
 from ..core import DirectoryScore
 from ..core.config import (
@@ -18,16 +22,74 @@ from ..core.config import (
     IGNORE_SYSTEM_DIRS,
     RECURSIVE_SCAN,
     SESSION_PREFIX,
+    ENABLE_SCAN_CACHE,
 )
-from ..utils import (
-    is_hidden_file,
-    is_system_directory,
-    get_file_extension,
-    validate_directory,
-)
+from ..utils import get_extension_name, is_hidden_name
+from .scan_cache import ScanCache
 
 logger = logging.getLogger(__name__)
 
+# Most common extensions, tracked as bits of a single int while scanning
+_COMMON_EXTENSIONS = (
+    "jpg", "jpeg", "png", "gif", "heic", "webp", "svg", "bmp",
+    "pdf", "doc", "docx", "txt", "md", "rtf", "odt", "pages",
+    "xls", "xlsx", "csv", "numbers", "ppt", "pptx", "key", "epub",
+    "mp4", "mov", "mkv", "avi", "webm", "mp3", "wav", "m4a",
+    "flac", "aac", "zip", "rar", "7z", "tar", "gz", "dmg",
+    "pkg", "iso", "exe", "msi", "deb", "apk", "app", "py",
+    "js", "ts", "html", "css", "json", "xml", "yaml", "yml",
+    "sh", "c", "cpp", "h", "java", "go", "rs", "sql",
+)
+_EXT_BITS = {ext: 1 << i for i, ext in enumerate(_COMMON_EXTENSIONS)}
+
+# Thresholds at which _calculate_score stops changing:
+# log10(999 + 1) / 3 == 1.0 and 10 / 10.0 == 1.0
+_SATURATION_FILES = 999
+_SATURATION_TYPES = 10
+
+
+# Shared instances of identical extension profiles across scores
+_EXTENSION_PROFILES: Dict[FrozenSet[str], FrozenSet[str]] = {}
+
+
+def _intern_extensions(extensions) -> FrozenSet[str]:
+    """Return a shared frozenset equal to the given extensions."""
+    profile = frozenset(extensions)
+    return _EXTENSION_PROFILES.setdefault(profile, profile)
+
+
+# os.fwalk yields an open fd per directory so files can be statted relative to it
+_HAVE_FWALK = hasattr(os, "fwalk") and os.stat in os.supports_dir_fd
+
+
+class _FileEntry:
+    """Minimal os.DirEntry stand-in for files found by os.fwalk, with a pre-fetched stat."""
+
+    __slots__ = ("name", "path", "_stat")
+
+    def __init__(self, name: str, path: str, stat_result: os.stat_result):
+        self.name = name
+        self.path = path
+        self._stat = stat_result
+
+    def stat(self, follow_symlinks: bool = True) -> os.stat_result:
+        return self._stat
+
+    def is_file(self, follow_symlinks: bool = True) -> bool:
+        return True
+
+    def __fspath__(self) -> str:
+        return self.path
+
+
+def _decode_extensions(ext_mask: int, rare_extensions: Set[str]) -> Set[str]:
+    """Rebuild the extension set from a common-extension bitmask and rare extensions."""
+    extensions = set(rare_extensions)
+    for i, ext in enumerate(_COMMON_EXTENSIONS):
+        if ext_mask >> i & 1:
+            extensions.add(ext)
+    return extensions
+
 
 class DirectoryScanner:
     """
@@ -37,7 +99,9 @@ class DirectoryScanner:
     def __init__(self,
                  ignore_hidden: bool = IGNORE_HIDDEN_FILES,
                  ignore_system_dirs: Set[str] = IGNORE_SYSTEM_DIRS,
-                 recursive: bool = None):
+                 recursive: bool = None,
+                 cache: Optional[ScanCache] = None,
+                 use_cache: Optional[bool] = None):
         """
         Initialize the scanner.
         
@@ -45,19 +109,38 @@ class DirectoryScanner:
             ignore_hidden: Whether to ignore hidden files
             ignore_system_dirs: Set of system directory names to ignore
             recursive: Whether to scan subdirectories recursively (None uses config default)
+            cache: Scan result cache (None uses the default cache)
+            use_cache: Whether to cache scan results at all (None caches if a
+                cache is given or caching is enabled in config)
         """
         self.ignore_hidden = ignore_hidden
         self.ignore_system_dirs = ignore_system_dirs
+        # Frozen copy for O(1) membership checks in the scan loop
+        self._ignore_dirs = frozenset(ignore_system_dirs or ())
         # Use config value if not explicitly specified
         self.recursive = recursive if recursive is not None else RECURSIVE_SCAN
+        if use_cache is None:
+            use_cache = cache is not None or ENABLE_SCAN_CACHE
+        if not use_cache:
+            cache = None
+        elif cache is None:
+            cache = ScanCache()
+        self.cache = cache
+        self._ignore_dirs_digest = hashlib.sha1(
+            "\0".join(sorted(self._ignore_dirs)).encode("utf-8")
+        ).hexdigest()[:12]
     
-    def scan_directory(self, directory: Path, recursive: bool = None) -> DirectoryScore:
+    def scan_directory(self, directory: Path, recursive: bool = None,
+                       fast_recommend: bool = False) -> DirectoryScore:
         """
         Scan a directory and calculate its archiving score.
         
         Args:
             directory: Directory to scan
             recursive: Override the instance recursive setting for this scan
+            fast_recommend: Stop scanning once the score can no longer change.
+                total_files and total_size are then lower bounds and the
+                result is marked as truncated.
             
         Returns:
             DirectoryScore object
@@ -65,12 +148,16 @@ class DirectoryScanner:
         # Use parameter if provided, otherwise use instance setting
         scan_recursive = recursive if recursive is not None else self.recursive
         
-        logger.info(f"Scanning directory: {directory} (recursive={scan_recursive})")
+        logger.info("Scanning directory: %s (recursive=%s)", directory, scan_recursive)
         
-        # Validate directory
-        is_valid, error = validate_directory(directory)
-        if not is_valid:
-            logger.warning(f"Invalid directory {directory}: {error}")
+        # A single stat both validates the directory and provides the cache key
+        try:
+            st = os.stat(directory)
+            error = None if stat.S_ISDIR(st.st_mode) else "not a directory"
+        except OSError as e:
+            error = e
+        if error is not None:
+            logger.warning("Invalid directory %s: %s", directory, error)
             return DirectoryScore(
                 path=directory,
                 total_files=0,
@@ -80,52 +167,193 @@ class DirectoryScanner:
                 recursive=scan_recursive
             )
         
-        total_files = 0
-        total_size = 0
-        extensions: Set[str] = set()
+        # Reuse the previous result while the directory is unchanged
+        mtime_ns = None
+        if self.cache is not None:
+            mtime_ns = st.st_mtime_ns
+            cached = self.cache.get(directory, mtime_ns, scan_recursive,
+                                    self._cache_variant())
+            if cached is not None:
+                logger.info("Using cached scan for %s", directory.name)
+                extensions = _intern_extensions(cached["extensions"])
+                return DirectoryScore(
+                    path=directory,
+                    total_files=cached["total_files"],
+                    file_types=len(extensions),
+                    total_size=cached["total_size"],
+                    score=self._calculate_score(cached["total_files"], len(extensions)),
+                    extensions=extensions,
+                    recursive=scan_recursive
+                )
+        
+        score = self.score_entries(
+            directory,
+            self.iter_entries(directory, scan_recursive),
+            recursive=scan_recursive,
+            fast_recommend=fast_recommend,
+        )
         
-        try:
-            # Use rglob for recursive, glob for non-recursive
-            pattern = "**/*" if scan_recursive else "*"
-            iterator = directory.glob(pattern)
+        # Only complete results are cached
+        if mtime_ns is not None and not score.truncated:
+            self.cache.put(directory, mtime_ns, scan_recursive,
+                           score.total_files, score.total_size, score.extensions,
+                           self._cache_variant())
+        
+        return score
+    
+    def _cache_variant(self) -> str:
+        """Fingerprint the filter settings a cached scan result depends on."""
+        return f"h{int(self.ignore_hidden)}:{self._ignore_dirs_digest}"
+    
+    def iter_entries(self, directory: Path, recursive: bool = None) -> Iterator[os.DirEntry]:
+        """
+        Walk a directory and yield the files that count towards its score.
+        
+        Hidden files are skipped if configured. In recursive mode, system and
+        archive output directories are not descended into. The yielded entries
+        can be shared between score_entries() and
+        FileClassifier.classify_entries() so a directory is only read once.
+        
+        Args:
+            directory: Directory to walk
+            recursive: Override the instance recursive setting for this walk
             
-            for item in iterator:
-                # Skip directories
-                if item.is_dir():
-                    if self._should_skip_directory(item):
-                        continue
-                    continue
-                
-                # Skip hidden files if configured
-                if self.ignore_hidden and is_hidden_file(item):
-                    continue
-                
-                # Skip if parent is a system directory or archive directory (only relevant in recursive mode)
-                if scan_recursive and (self._is_in_system_directory(item) or self._is_in_archive_directory(item)):
-                    continue
-                
-                # Count file
-                total_files += 1
-                
-                try:
-                    total_size += item.stat().st_size
-                except Exception as e:
-                    logger.warning(f"Could not get size of {item}: {e}")
+        Yields:
+            os.DirEntry-like objects (name, path, stat(), is_file()) for regular files
+        """
+        scan_recursive = recursive if recursive is not None else self.recursive
+        
+        # fwalk(follow_symlinks=False) yields nothing for a symlinked root
+        # (e.g. a linked ~/Downloads), so those are walked with scandir
+        if _HAVE_FWALK and not os.path.islink(directory):
+            return self._iter_entries_fwalk(directory, scan_recursive)
+        return self._iter_entries_scandir(directory, scan_recursive)
+    
+    def _iter_entries_fwalk(self, directory: Path, recursive: bool) -> Iterator[_FileEntry]:
+        """
+        Walk with os.fwalk, statting files relative to the open directory fd.
+        
+        fstatat() on the directory fd avoids resolving the full path for
+        every file, which adds up on deep trees.
+        """
+        ignore_hidden = self.ignore_hidden
+        
+        def on_error(e: OSError):
+            logger.error("Error scanning directory %s: %s", e.filename, e)
+        
+        # fwalk opens the root itself without going through onerror, so an
+        # unreadable root raises here instead
+        try:
+            for root, dirs, files, root_fd in os.fwalk(directory, topdown=True,
+                                                       onerror=on_error,
+                                                       follow_symlinks=False):
+                # Prune in place so fwalk never descends into skipped directories
+                if recursive:
+                    dirs[:] = [d for d in dirs if not self._should_skip_directory(Path(d))]
+                else:
+                    dirs[:] = []
                 
-                # Track extension
-                ext = get_file_extension(item)
-                if ext:
-                    extensions.add(ext)
+                for name in files:
+                    # Skip hidden files if configured
+                    if ignore_hidden and is_hidden_name(name):
+                        continue
+                    
+                    try:
+                        st = os.stat(name, dir_fd=root_fd)
+                    except OSError as e:
+                        logger.warning("Could not read %s: %s", os.path.join(root, name), e)
+                        continue
+                    
+                    if stat.S_ISREG(st.st_mode):
+                        yield _FileEntry(name, os.path.join(root, name), st)
+        except OSError as e:
+            logger.error("Error scanning directory %s: %s", directory, e)
+    
+    def _iter_entries_scandir(self, directory: Path, recursive: bool) -> Iterator[os.DirEntry]:
+        """Walk with os.scandir, for platforms without os.fwalk."""
+        ignore_hidden = self.ignore_hidden
+        
+        stack = [os.fspath(directory)]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if recursive and not self._should_skip_directory(Path(entry.path)):
+                                    stack.append(entry.path)
+                                continue
+                            
+                            # Skip hidden files if configured
+                            if ignore_hidden and is_hidden_name(entry.name):
+                                continue
+                            
+                            if entry.is_file():
+                                yield entry
+                        except OSError as e:
+                            logger.warning("Could not read %s: %s", entry.path, e)
+            except OSError as e:
+                logger.error("Error scanning directory %s: %s", current, e)
+    
+    def score_entries(self, directory: Path, entries: Iterable[os.DirEntry],
+                      recursive: bool = None,
+                      fast_recommend: bool = False) -> DirectoryScore:
+        """
+        Reduce walked file entries to a DirectoryScore.
+        
+        Args:
+            directory: Directory the entries belong to
+            entries: File entries, e.g. from iter_entries()
+            recursive: Whether the entries include subdirectories (None uses instance setting)
+            fast_recommend: Stop consuming entries once the score can no longer change
+            
+        Returns:
+            DirectoryScore object
+        """
+        scan_recursive = recursive if recursive is not None else self.recursive
+        
+        total_files = 0
+        total_size = 0
+        # Common extensions are OR-ed into a bitmask; only rare ones need a set
+        ext_mask = 0
+        rare_extensions: Set[str] = set()
+        ext_bits = _EXT_BITS
+        truncated = False
+        
+        for entry in entries:
+            # Count file
+            total_files += 1
+            
+            try:
+                total_size += entry.stat().st_size
+            except OSError as e:
+                logger.warning("Could not get size of %s: %s", entry.path, e)
+            
+            # Track extension
+            ext = get_extension_name(entry.name)
+            if ext:
+                bit = ext_bits.get(ext)
+                if bit:
+                    ext_mask |= bit
+                else:
+                    rare_extensions.add(ext)
+            
+            # Further files cannot change a saturated score
+            if (fast_recommend
+                    and total_files >= _SATURATION_FILES
+                    and bin(ext_mask).count("1") + len(rare_extensions) >= _SATURATION_TYPES):
+                truncated = True
+                break
         
-        except Exception as e:
-            logger.error(f"Error scanning directory {directory}: {e}")
+        extensions = _decode_extensions(ext_mask, rare_extensions)
         
         # Calculate score
         score = self._calculate_score(total_files, len(extensions))
         
         logger.info(
-            f"Scanned {directory.name}: "
-            f"{total_files} files, {len(extensions)} types, score={score:.2f}"
+            "Scanned %s: %d files, %d types, score=%.2f",
+            directory.name, total_files, len(extensions), score
         )
         
         return DirectoryScore(
@@ -134,17 +362,20 @@ class DirectoryScanner:
             file_types=len(extensions),
             total_size=total_size,
             score=score,
-            extensions=extensions,
-            recursive=scan_recursive
+            extensions=_intern_extensions(extensions),
+            recursive=scan_recursive,
+            truncated=truncated
         )
     
     def scan_multiple_directories(self, 
-                                  directories: List[Path]) -> List[DirectoryScore]:
+                                  directories: List[Path],
+                                  fast_recommend: bool = False) -> List[DirectoryScore]:
         """
         Scan multiple directories.
         
         Args:
             directories: List of directories to scan
+            fast_recommend: Stop each scan once its score saturates
             
         Returns:
             List of DirectoryScore objects
@@ -152,45 +383,45 @@ class DirectoryScanner:
         scores = []
         
         for directory in directories:
-            score = self.scan_directory(directory)
+            score = self.scan_directory(directory, fast_recommend=fast_recommend)
             scores.append(score)
         
+        self.save_cache()
+        
         return scores
     
+    def save_cache(self):
+        """Persist cached scan results, if caching is enabled."""
+        if self.cache is not None:
+            self.cache.save()
+    
     def get_recommendations(self, 
                            directories: List[Path],
-                           top_n: int = 5) -> List[DirectoryScore]:
+                           top_n: int = 5,
+                           fast_recommend: bool = True) -> List[DirectoryScore]:
         """
         Get top N recommended directories for archiving.
         
         Args:
             directories: List of directories to evaluate
             top_n: Number of top recommendations to return
+            fast_recommend: Stop scanning directories whose score has saturated
             
         Returns:
             List of DirectoryScore objects, sorted by score descending
         """
-        logger.info(f"Generating recommendations for {len(directories)} directories")
+        logger.info("Generating recommendations for %d directories", len(directories))
         
-        scores = self.scan_multiple_directories(directories)
+        scores = self.scan_multiple_directories(directories, fast_recommend=fast_recommend)
         
-        # Filter out directories with too few files
-        filtered_scores = [
-            s for s in scores 
-            if s.total_files >= MIN_FILES_FOR_RECOMMENDATION
-        ]
-        
-        # Sort by score descending
-        sorted_scores = sorted(
-            filtered_scores, 
-            key=lambda x: x.score, 
-            reverse=True
+        # Filter out directories with too few files and keep the top N by score
+        result = heapq.nlargest(
+            top_n,
+            (s for s in scores if s.total_files >= MIN_FILES_FOR_RECOMMENDATION),
+            key=lambda s: s.score,
         )
         
-        # Return top N
-        result = sorted_scores[:top_n]
-        
-        logger.info(f"Generated {len(result)} recommendations")
+        logger.info("Generated %d recommendations", len(result))
         
         return result
     
@@ -226,7 +457,7 @@ class DirectoryScanner:
     def _should_skip_directory(self, directory: Path) -> bool:
         """Check if a directory should be skipped."""
         # Skip system directories
-        if is_system_directory(directory, self.ignore_system_dirs):
+        if directory.name in self._ignore_dirs:
             return True
         
         # Skip archiver's own output directories
@@ -259,21 +490,7 @@ class DirectoryScanner:
         pattern = rf'.*_{re.escape(SESSION_PREFIX)}_\d{{8}}_\d{{6}}$'
         
         if re.match(pattern, dir_name):
-            logger.debug(f"Skipping archive output directory: {dir_name}")
+            logger.debug("Skipping archive output directory: %s", dir_name)
             return True
         
         return False
-    
-    def _is_in_system_directory(self, file_path: Path) -> bool:
-        """Check if a file is inside a system directory."""
-        for parent in file_path.parents:
-            if is_system_directory(parent, self.ignore_system_dirs):
-                return True
-        return False
-    
-    def _is_in_archive_directory(self, file_path: Path) -> bool:
-        """Check if a file is inside an archive output directory."""
-        for parent in file_path.parents:
-            if self._is_archive_output_directory(parent):
-                return True
-        return False
@@ -40,6 +40,7 @@ setup(
             "python-magic>=0.4.27",
             "Pillow>=10.0.0",
             "imagehash>=4.3.1",
+            "blake3>=0.4.1",
         ],
         "dev": [
             "pytest>=7.4.0",
@@ -3,11 +3,12 @@ Example tests for File Archiver.
 Run with: pytest tests/
 """
 
+import os
 import pytest
 from pathlib import Path
 from file_archiver.core import FileInfo, FileStatus
 from file_archiver.core.config import get_category_for_extension
-from file_archiver.utils import get_file_extension, format_file_size
+from file_archiver.utils import get_file_extension, format_file_size, get_file_digest, get_file_hash
 
 
 class TestUtils:
@@ -19,6 +20,8 @@ class TestUtils:
         assert get_file_extension(Path("document.docx")) == "docx"
         assert get_file_extension(Path("archive.tar.gz")) == "gz"
         assert get_file_extension(Path("noextension")) == ""
+        assert get_file_extension(Path("PHOTO.JPG")) == "jpg"
+        assert get_file_extension(Path(".bashrc")) == ""
 
     def test_format_file_size(self):
         """Test file size formatting."""
@@ -27,6 +30,62 @@ class TestUtils:
         assert format_file_size(1024 * 1024) == "1.0 MB"
         assert format_file_size(1024 * 1024 * 1024) == "1.0 GB"
 
+    def test_get_file_hash_tracks_file_changes(self, tmp_path):
+        """Test that memoized hashes are invalidated when a file changes."""
+        import hashlib
+
+        path = tmp_path / "data.bin"
+        path.write_bytes(b"first")
+        assert get_file_hash(path) == hashlib.sha256(b"first").hexdigest()
+        assert get_file_hash(path) == hashlib.sha256(b"first").hexdigest()
+
+        path.write_bytes(b"second version")
+        assert get_file_hash(path) == hashlib.sha256(b"second version").hexdigest()
+        assert get_file_digest(path) == hashlib.sha256(b"second version").digest()
+        assert get_file_hash(tmp_path / "missing") is None
+
+    def test_get_file_hashes_keeps_order(self, tmp_path):
+        """Test that parallel hashing returns results in input order."""
+        from file_archiver.utils import get_file_hashes
+
+        paths = []
+        for i in range(20):
+            path = tmp_path / f"file{i}.bin"
+            path.write_bytes(str(i).encode() * (i + 1))
+            paths.append(path)
+        paths.append(tmp_path / "missing")
+
+        hashes = get_file_hashes(paths, max_workers=4)
+
+        assert hashes[:-1] == [get_file_hash(path) for path in paths[:-1]]
+        assert hashes[-1] is None
+
+    def test_safe_filename(self):
+        """Test that runs of invalid characters collapse to one underscore."""
+        from file_archiver.utils import safe_filename
+
+        assert safe_filename("report: final?.pdf") == "report_ final_.pdf"
+        assert safe_filename('a<>:"b') == "a_b"
+        assert safe_filename(" ..hidden. ") == "hidden"
+        assert safe_filename("...") == "unnamed"
+
+    def test_ensure_unique_path(self, tmp_path):
+        """Test that the lowest free counter is used for colliding names."""
+        from file_archiver.utils import ensure_unique_path
+
+        target = tmp_path / "report.txt"
+        assert ensure_unique_path(target) == target
+
+        target.write_text("x")
+        for counter in range(1, 6):
+            (tmp_path / f"report_{counter}.txt").write_text("x")
+
+        assert ensure_unique_path(target) == tmp_path / "report_6.txt"
+
+        # Gaps left by deleted copies are filled first
+        (tmp_path / "report_3.txt").unlink()
+        assert ensure_unique_path(target) == tmp_path / "report_3.txt"
+
 
 class TestConfig:
     """Test configuration."""
@@ -94,13 +153,157 @@ class TestScanner:
         """Test scanning a directory."""
         from file_archiver.services import DirectoryScanner
 
-        scanner = DirectoryScanner()
+        scanner = DirectoryScanner(use_cache=False)
         score = scanner.scan_directory(temp_test_dir)
 
         assert score.total_files == 3
         assert score.file_types == 3  # pdf, jpg, py
         assert score.score > 0
 
+    def test_scan_cache_reused_until_directory_changes(self, temp_test_dir, tmp_path_factory):
+        """Test that cached scans are returned until the directory changes."""
+        from file_archiver.services import DirectoryScanner
+        from file_archiver.services.scan_cache import ScanCache
+
+        cache_file = tmp_path_factory.mktemp("cache") / "scan_cache.json"
+        scanner = DirectoryScanner(recursive=False, cache=ScanCache(cache_file))
+        scanner.scan_multiple_directories([temp_test_dir])
+        assert cache_file.exists()
+
+        # A fresh scanner reads the persisted entry
+        cached = DirectoryScanner(recursive=False, cache=ScanCache(cache_file))
+        score = cached.scan_directory(temp_test_dir)
+        assert score.total_files == 3
+        assert score.extensions == {"pdf", "jpg", "py"}
+
+        # Adding a file bumps the directory mtime and invalidates the entry
+        (temp_test_dir / "notes.txt").write_text("new")
+        os.utime(temp_test_dir, ns=(0, temp_test_dir.stat().st_mtime_ns + 1))
+        score = cached.scan_directory(temp_test_dir)
+        assert score.total_files == 4
+
+    @pytest.mark.parametrize("use_fwalk", [True, False])
+    def test_scan_symlinked_root(self, temp_test_dir, tmp_path_factory, monkeypatch, use_fwalk):
+        """Test that a symlinked directory is scanned through the link."""
+        from file_archiver.services import DirectoryScanner
+        from file_archiver.services import scanner as scanner_module
+
+        if use_fwalk and not hasattr(os, "fwalk"):
+            pytest.skip("os.fwalk not available on this platform")
+        monkeypatch.setattr(scanner_module, "_HAVE_FWALK", use_fwalk)
+
+        link = tmp_path_factory.mktemp("links") / "Downloads"
+        try:
+            link.symlink_to(temp_test_dir, target_is_directory=True)
+        except OSError:
+            pytest.skip("symlinks not supported here")
+
+        scanner = DirectoryScanner(recursive=False, use_cache=False)
+        assert len(list(scanner.iter_entries(link))) == 3
+        assert scanner.scan_directory(link).total_files == 3
+
+    def test_unreadable_root_scores_empty(self, temp_test_dir, monkeypatch):
+        """Test that a directory that can't be listed gives an empty score."""
+        from file_archiver.services import DirectoryScanner
+
+        def deny(*args, **kwargs):
+            raise PermissionError(13, "Permission denied", str(temp_test_dir))
+
+        monkeypatch.setattr(os, "fwalk", deny, raising=False)
+        monkeypatch.setattr(os, "scandir", deny)
+
+        scanner = DirectoryScanner(recursive=False, use_cache=False)
+        assert scanner.scan_directory(temp_test_dir).total_files == 0
+
+    def test_scan_cache_keyed_by_scanner_settings(self, temp_test_dir, tmp_path_factory):
+        """Test that scanners with different filters don't share cached results."""
+        from file_archiver.services import DirectoryScanner
+        from file_archiver.services.scan_cache import ScanCache
+
+        (temp_test_dir / ".hidden1").write_text("x")
+        (temp_test_dir / ".hidden2").write_text("x")
+        cache = ScanCache(tmp_path_factory.mktemp("cache") / "scan_cache.json")
+
+        hiding = DirectoryScanner(ignore_hidden=True, recursive=False, cache=cache)
+        showing = DirectoryScanner(ignore_hidden=False, recursive=False, cache=cache)
+
+        assert hiding.scan_directory(temp_test_dir).total_files == 3
+        assert showing.scan_directory(temp_test_dir).total_files == 5
+
+    def test_scan_cache_keeps_most_recent_entries(self, tmp_path):
+        """Test that the cache file is pruned to the most recently used entries."""
+        from file_archiver.services.scan_cache import ScanCache
+
+        cache_file = tmp_path / "scan_cache.json"
+        dirs = []
+        for name in ("a", "b", "c"):
+            directory = tmp_path / name
+            directory.mkdir()
+            dirs.append(directory)
+
+        # Each run uses a fresh instance, so recency has to survive a reload
+        cache = ScanCache(cache_file, max_entries=2)
+        cache.put(dirs[0], 1, False, 0, 0, [])
+        cache.put(dirs[1], 1, False, 0, 0, [])
+        cache.save()
+
+        cache = ScanCache(cache_file, max_entries=2)
+        assert cache.get(dirs[0], 1, False) is not None  # a is now more recent than b
+        cache.save()
+
+        cache = ScanCache(cache_file, max_entries=2)
+        cache.put(dirs[2], 1, False, 0, 0, [])
+        cache.save()
+
+        reloaded = ScanCache(cache_file, max_entries=2)
+        assert reloaded.get(dirs[0], 1, False) is not None
+        assert reloaded.get(dirs[1], 1, False) is None
+        assert reloaded.get(dirs[2], 1, False) is not None
+
+    def test_fast_recommend_stops_at_saturated_score(self, tmp_path):
+        """Test that fast scans stop early without changing the score."""
+        from file_archiver.services import DirectoryScanner
+
+        for i in range(1100):
+            (tmp_path / f"file{i}.ext{i % 12}").write_text("x")
+
+        # A cached full result would mask truncation
+        scanner = DirectoryScanner(recursive=False, use_cache=False)
+        full = scanner.scan_directory(tmp_path)
+        fast = scanner.scan_directory(tmp_path, fast_recommend=True)
+
+        assert not full.truncated
+        assert fast.truncated
+        assert fast.total_files < full.total_files
+        assert fast.score == full.score
+        assert fast.files_formatted.endswith("+")
+        assert fast.size_formatted.endswith("+")
+        assert not full.size_formatted.endswith("+")
+
+    @pytest.mark.parametrize("use_fwalk", [True, False])
+    def test_shared_walk_for_scoring_and_classification(self, temp_test_dir, monkeypatch, use_fwalk):
+        """Test that one walk can feed both the scanner and the classifier."""
+        from file_archiver.services import DirectoryScanner, FileClassifier
+        from file_archiver.services import scanner as scanner_module
+
+        if use_fwalk and not hasattr(os, "fwalk"):
+            pytest.skip("os.fwalk not available on this platform")
+        monkeypatch.setattr(scanner_module, "_HAVE_FWALK", use_fwalk)
+
+        (temp_test_dir / "node_modules").mkdir()
+        (temp_test_dir / "node_modules" / "index.js").write_text("x")
+        (temp_test_dir / "sub").mkdir()
+        (temp_test_dir / "sub" / "song.mp3").write_text("x")
+        (temp_test_dir / ".hidden").write_text("x")
+
+        scanner = DirectoryScanner(recursive=True, use_cache=False)
+        entries = list(scanner.iter_entries(temp_test_dir))
+        score = scanner.score_entries(temp_test_dir, entries)
+        files = FileClassifier(enable_hashing=False).classify_entries(entries)
+
+        assert score.total_files == 4  # node_modules and hidden files skipped
+        assert {f.name for f in files} == {"document.pdf", "image.jpg", "code.py", "song.mp3"}
+
 
 class TestClassifier:
     """Test file classifier."""
@@ -131,6 +334,79 @@ class TestClassifier:
         assert "images" in categories
         assert "code" in categories
 
+    def test_find_duplicates(self, tmp_path):
+        """Test that only files with identical content are reported."""
+        from file_archiver.services import FileClassifier
+
+        big = b"x" * (70 * 1024)
+        (tmp_path / "a.bin").write_bytes(big + b"1")
+        (tmp_path / "b.bin").write_bytes(big + b"1")
+        (tmp_path / "c.bin").write_bytes(big + b"2")  # same size and head, different tail
+        (tmp_path / "d.txt").write_text("small")
+        (tmp_path / "e.txt").write_text("small")
+        (tmp_path / "f.txt").write_text("other")
+
+        classifier = FileClassifier(enable_hashing=True)
+        files = classifier.classify_directory(tmp_path, recursive=False)
+        duplicates = classifier.find_duplicates(files)
+
+        pairs = {frozenset((a.name, b.name)) for a, b in duplicates}
+        assert pairs == {frozenset(("a.bin", "b.bin")), frozenset(("d.txt", "e.txt"))}
+
+
+class TestMover:
+    """Test file moving."""
+
+    def test_parallel_moves_keep_colliding_files(self, tmp_path, monkeypatch):
+        """Test that same-named files moved in parallel get unique names."""
+        import io
+        import shutil
+        import time
+        from rich.console import Console
+        from file_archiver.services import FileClassifier, FileMover
+        from file_archiver.ui.cli_beautiful import BeautifulCLI
+
+        sources = []
+        contents = set()
+        for i in range(20):
+            source = tmp_path / "src" / f"folder{i}"
+            source.mkdir(parents=True)
+            sources.append(source)
+            # Every folder has a report.pdf, so all of them collide in one category
+            for name in ("report.pdf", f"photo{i}.jpg", f"song{i}.mp3"):
+                content = f"{name} from folder {i}"
+                (source / name).write_text(content)
+                contents.add(content)
+
+        classifier = FileClassifier(enable_hashing=False)
+        files = classifier.classify_multiple_directories(sources)
+
+        # A slow move widens the gap between the collision check and the move
+        real_move = shutil.move
+
+        def slow_move(src, dst):
+            time.sleep(0.005)
+            return real_move(src, dst)
+
+        monkeypatch.setattr(shutil, "move", slow_move)
+
+        cli = BeautifulCLI()
+        cli.console = Console(file=io.StringIO())
+        cli.mover = FileMover(archive_base=tmp_path / "archive", collision_policy="suffix")
+        session = cli._execute_with_progress(sources, files, [])
+
+        assert len(session.files) == 60
+        assert all(f.status == FileStatus.MOVED for f in session.files)
+        assert not any(path.is_file() for path in (tmp_path / "src").rglob("*"))
+
+        # Nothing was overwritten: every file's content arrived exactly once
+        destinations = [f.destination for f in session.files]
+        assert len(set(destinations)) == len(destinations)
+        assert {path.read_text() for path in destinations} == contents
+
+        reports = sorted(path.name for path in destinations if path.name.startswith("report"))
+        assert reports == sorted(["report.pdf"] + [f"report_{i}.pdf" for i in range(1, 20)])
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
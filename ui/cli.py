@@ -4,6 +4,8 @@ Provides interactive CLI for organizing files.
 """
 
 import logging
+import os
+import stat
 import sys
 from pathlib import Path
 from typing import List, Optional
@@ -15,7 +17,7 @@ from ..services import (
     FileMover,
     Reporter,
 )
-from ..utils import pluralize, format_file_size
+from ..utils import pluralize, format_file_size, clear_file_hash_cache
 
 logger = logging.getLogger(__name__)
 
@@ -63,11 +65,10 @@ class CLI:
             print(
                 f"\n🔍 Analyzing files in {len(selected_dirs)} {pluralize(len(selected_dirs), 'directory', 'directories').split()[1]}..."
             )
-            # Use consistent recursive setting between scanner and classifier
-            # Temporarily override classifier's recursive setting
+            # Classify through the scanner's walk so what we scan matches what we classify
             files = []
             for directory in selected_dirs:
-                dir_files = self.classifier.classify_directory(directory, recursive=self.scanner.recursive)
+                dir_files = self.classifier.classify_entries(self.scanner.iter_entries(directory))
                 files.extend(dir_files)
 
             if not files:
@@ -123,6 +124,9 @@ class CLI:
             logger.error(f"Unexpected error: {e}", exc_info=True)
             print(f"\n❌ Error: {e}")
             sys.exit(1)
+        finally:
+            # Hashes are only reused within a session
+            clear_file_hash_cache()
 
     def print_header(self):
         """Print the application header."""
@@ -158,11 +162,14 @@ class CLI:
             # Expand user home directory
             path = Path(dir_str).expanduser().resolve()
 
-            if not path.exists():
-                print(f"⚠️  Directory not found: {path}")
+            # One stat covers both the existence and directory checks
+            try:
+                st = os.stat(path)
+            except OSError:
+                print(f"⚠️  Directory not found or not accessible: {path}")
                 continue
 
-            if not path.is_dir():
+            if not stat.S_ISDIR(st.st_mode):
                 print(f"⚠️  Not a directory: {path}")
                 continue
 
@@ -192,7 +199,7 @@ class CLI:
             
             print(f"{i}. {display_path}")
             print(f"   Score: {rec.score:.1f}/10")
-            print(f"   Files: {rec.total_files}")
+            print(f"   Files: {rec.files_formatted}")
             print(f"   Types: {rec.file_types} different extensions")
             print(f"   Size: {rec.size_formatted}")
             print()
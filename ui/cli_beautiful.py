@@ -4,35 +4,67 @@ Beautiful, Apple-style CLI interface for File Archiver.
 Clean, minimal, and delightful to use.
 """
 
+import heapq
 import logging
+import os
 import re
+import threading
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from operator import attrgetter
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Final, Iterable, List, Optional, Tuple
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
-from rich.tree import Tree
 from rich.prompt import Prompt, Confirm
-from rich.layout import Layout
 from rich import box
-from rich.style import Style
 
 from ..core import DirectoryScore, ArchiveSession
-from ..core.config import SESSION_PREFIX
+from ..core.config import MIN_FILES_FOR_RECOMMENDATION, SESSION_PREFIX
 from ..services import (
     DirectoryScanner,
     FileClassifier,
     FileMover,
     Reporter,
 )
-from ..utils import pluralize, format_file_size, create_directory_safe
+from ..utils import pluralize, format_file_size, create_directory_safe, clear_file_hash_cache
 
 logger = logging.getLogger(__name__)
 
 # Disable verbose logging for clean output
 logging.getLogger().setLevel(logging.ERROR)
 
+# Folders never worth descending into during smart scan
+_SKIP_DIR_NAMES = frozenset({
+    '.git', 'node_modules', '.venv', 'venv', '__pycache__',
+    '.cache', 'Library', '.Trash', '.npm', '.cargo',
+    'Applications', 'System', '.local', '.config'
+})
+
+# Resolved once; Path.home() looks up the user database on each call
+_HOME: Final[Path] = Path.home()
+_HOME_STR: Final[str] = str(_HOME)
+
+# Progress bars redraw at most this often; per-item redraws are costly on fast scans
+_PROGRESS_REFRESH_HZ = 4
+
+# Per-file progress (moves, classification) is reported in batches of this many
+# files, or at least this often in seconds
+_PROGRESS_BATCH_SIZE = 64
+_PROGRESS_BATCH_INTERVAL = 0.1
+
+# Listing a directory by descriptor lets per-file stats use fstatat (not on Windows)
+_HAVE_SCANDIR_FD = os.scandir in os.supports_fd and hasattr(os, "O_DIRECTORY")
+
+# Threads used to read directories in parallel during smart scan
+_WALK_WORKERS = min(32, (os.cpu_count() or 1) * 2)
+
+# Threads used to move files in parallel
+_MOVE_WORKERS = 8
+
 
 class BeautifulCLI:
     """
@@ -91,7 +123,7 @@ class BeautifulCLI:
             else:
                 # For quick and manual mode: use directories directly without filtering
                 if mode == "quick":
-                    selected_dirs = [Path.home() / "Downloads"]
+                    selected_dirs = [_HOME / "Downloads"]
                 else:  # manual
                     selected_dirs = self._get_directories()
                 
@@ -133,6 +165,9 @@ class BeautifulCLI:
             self.console.print("\n\n[dim]Operation cancelled. Goodbye! 👋[/dim]")
         except Exception as e:
             self.console.print(f"\n[red]Error: {e}[/red]")
+        finally:
+            # Hashes are only reused within a session
+            clear_file_hash_cache()
     
     def _show_welcome(self):
         """Show beautiful welcome screen."""
@@ -210,19 +245,20 @@ class BeautifulCLI:
         
         # Get directories to scan based on scope
         scan_dirs = []
-        home = Path.home()
         
         if scope == "1":
             # Entire home
-            scan_dirs = [home]
+            scan_dirs = [_HOME]
         elif scope == "2":
             # Common locations
             common = ["Downloads", "Desktop", "Documents", "Pictures"]
-            scan_dirs = [home / d for d in common if (home / d).exists()]
+            home_children = self._home_directories()
+            scan_dirs = [home_children[d] for d in common if d in home_children]
         elif scope == "3":
             # Work folders
             work = ["Projects", "Code", "Work", "dev", "Development"]
-            scan_dirs = [home / d for d in work if (home / d).exists()]
+            home_children = self._home_directories()
+            scan_dirs = [home_children[d] for d in work if d in home_children]
         else:
             # Custom
             return self._get_directories()
@@ -230,43 +266,29 @@ class BeautifulCLI:
         # Perform deep scan
         self.console.print("\n[bold]Scanning your Mac...[/bold]")
         
-        all_directories = []
-        scanned_count = 0
-        
         with Progress(
             SpinnerColumn(style="blue"),
             TextColumn("[progress.description]{task.description}"),
             BarColumn(complete_style="blue"),
             console=self.console,
-            transient=True
+            transient=True,
+            refresh_per_second=_PROGRESS_REFRESH_HZ
         ) as progress:
             
             task = progress.add_task("Finding folders...", total=None)
-            
-            for scan_dir in scan_dirs:
-                # Add the parent directory itself first
-                if not self._should_skip_dir(scan_dir):
-                    all_directories.append(scan_dir)
-                    scanned_count += 1
-                
-                try:
-                    for item in scan_dir.rglob("*"):
-                        if item.is_dir() and not self._should_skip_dir(item):
-                            all_directories.append(item)
-                            scanned_count += 1
-                            
-                            if scanned_count % 50 == 0:
-                                progress.update(task, description=f"Checked {scanned_count:,} folders...")
-                except PermissionError:
-                    continue
-            
-            progress.update(task, description=f"Checked {scanned_count:,} folders")
+            # Non-recursive scores only depend on a folder's own listing, so
+            # they are computed during the walk instead of in a second pass
+            score_inline = not self.scanner.recursive
+            checked, candidates = self._walk_directories(scan_dirs, progress, task, score_inline)
+            progress.update(task, description=f"Checked {checked:,} folders")
         
-        # Scan all found directories
-        self.console.print(f"[green]✓[/green] Found {len(all_directories)} folders\n")
+        self.console.print(f"[green]✓[/green] Found {checked} folders\n")
         
-        # Now scan them for messiness
-        recommendations = self._scan_directories(all_directories)
+        # Now rank them by messiness
+        if score_inline:
+            recommendations = self._rank_recommendations(candidates)
+        else:
+            recommendations = self._scan_directories(candidates)
         
         if not recommendations:
             self.console.print("[green]✓[/green] All folders are clean!\n")
@@ -276,34 +298,140 @@ class BeautifulCLI:
         
         return [rec.path for rec in recommendations]
     
-    def _should_skip_dir(self, directory: Path) -> bool:
-        """Check if directory should be skipped during scan."""
-        skip_names = {
-            '.git', 'node_modules', '.venv', 'venv', '__pycache__',
-            '.cache', 'Library', '.Trash', '.npm', '.cargo',
-            'Applications', 'System', '.local', '.config'
-        }
+    def _home_directories(self) -> Dict[str, Path]:
+        """
+        List the folders directly inside the home folder with a single read.
         
-        # Skip hidden dirs (except user home)
-        if directory.name.startswith('.') and directory != Path.home():
-            return True
+        Returns:
+            Mapping of folder name to path, empty if home can't be read
+        """
+        try:
+            with os.scandir(_HOME) as it:
+                return {entry.name: Path(entry.path) for entry in it if entry.is_dir()}
+        except OSError:
+            return {}
+    
+    def _walk_directories(self, scan_dirs: List[Path], progress, task,
+                          score_inline: bool = False) -> Tuple[int, List]:
+        """
+        Find all readable folders under the scan roots, reading directories in parallel.
+        
+        Each directory listing runs as its own task on a thread pool so the
+        per-directory syscall latency overlaps. A folder is only kept once
+        its own listing succeeds, which doubles as the read-permission check.
+        Only the main thread touches the progress bar.
         
-        # Skip system dirs
-        if directory.name in skip_names:
-            return True
+        Args:
+            scan_dirs: Roots to walk
+            progress: Progress bar to update
+            task: Progress task to update
+            score_inline: Score each folder from its listing and keep only
+                folders with enough files to be recommended
+        
+        Returns:
+            Tuple of (number of folders checked, candidates), where candidates
+            are DirectoryScore objects if score_inline is set, else all folder paths
+        """
+        checked = 0
+        candidates = []
         
-        # Skip archiver's own output directories
-        if self._is_archive_directory(directory):
-            return True
+        with ThreadPoolExecutor(max_workers=_WALK_WORKERS) as executor:
+            pending = {}
+            for scan_dir in scan_dirs:
+                # Roots are always walked, but only listed if not skipped themselves
+                scan_dir = str(scan_dir)
+                include = not self._should_skip_dir(os.path.basename(scan_dir), scan_dir)
+                future = executor.submit(self._read_directory, scan_dir, score_inline)
+                pending[future] = (scan_dir, include)
+            
+            while pending:
+                done, _ = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                for future in done:
+                    directory, include = pending.pop(future)
+                    result = future.result()
+                    if result is None:
+                        continue  # No read permission
+                    
+                    subdirs, score = result
+                    if include:
+                        checked += 1
+                        if not score_inline:
+                            candidates.append(Path(directory))
+                        elif score is not None:
+                            candidates.append(score)
+                    for subdir in subdirs:
+                        future = executor.submit(self._read_directory, subdir, score_inline)
+                        pending[future] = (subdir, True)
+                
+                progress.update(task, description=f"Checked {checked:,} folders...")
+        
+        return checked, candidates
+    
+    def _read_directory(self, directory: str,
+                        score_inline: bool) -> Optional[Tuple[List[str], Optional[DirectoryScore]]]:
+        """
+        List a folder once, returning its subdirectories to walk and, optionally, its score.
+        
+        Uses the d_type cached by scandir, so no per-entry stat is needed to
+        tell folders from files. Where supported the folder is opened once and
+        listed through its descriptor, so file stats for scoring resolve
+        relative to it instead of re-walking the full path. Paths stay plain
+        strings while walking; a Path is only built for folders with enough
+        files to be scored, and the score is None for the rest.
+        Returns None if the folder can't be read.
+        """
+        subdirs = []
+        files = []
+        score = None
+        ignore_hidden = self.scanner.ignore_hidden
+        dir_fd = None
         
-        # Skip if no read permission
         try:
-            next(directory.iterdir(), None)
-            return False
-        except PermissionError:
-            return True
+            if _HAVE_SCANDIR_FD:
+                dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+            
+            with os.scandir(directory if dir_fd is None else dir_fd) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        # entry.path is only the name when listing a descriptor
+                        path = os.path.join(directory, entry.name)
+                        if not self._should_skip_dir(entry.name, path):
+                            subdirs.append(path)
+                    elif score_inline and not (ignore_hidden and entry.name.startswith(".")):
+                        files.append(entry)
+            
+            # Scored while the descriptor is still open
+            if score_inline:
+                files = [entry for entry in files if entry.is_file()]
+                if len(files) >= MIN_FILES_FOR_RECOMMENDATION:
+                    score = self.scanner.score_entries(Path(directory), files, recursive=False)
+        except OSError:
+            return None
+        finally:
+            if dir_fd is not None:
+                os.close(dir_fd)
+        
+        return subdirs, score
+    
+    def _should_skip_dir(self, name: str, path: str) -> bool:
+        """
+        Check if directory should be skipped during scan.
+        
+        Takes the name and path strings straight from a DirEntry so the walker
+        never builds Path objects. Unreadable folders are handled by the walker,
+        whose scandir call fails with PermissionError, so no separate permission
+        probe is made.
+        """
+        return (
+            # Skip system dirs
+            name in _SKIP_DIR_NAMES
+            # Skip hidden dirs (except user home)
+            or (name.startswith('.') and path != _HOME_STR)
+            # Skip archiver's own output directories
+            or self._is_archive_directory(name)
+        )
     
-    def _is_archive_directory(self, directory: Path) -> bool:
+    def _is_archive_directory(self, dir_name: str) -> bool:
         """
         Check if a directory is an archive output created by this tool.
         
@@ -311,13 +439,11 @@ class BeautifulCLI:
         where timestamp is in the format YYYYMMDD_HHMMSS
         
         Args:
-            directory: Directory to check
+            dir_name: Name of the directory to check
             
         Returns:
             True if this is an archive output directory
         """
-        dir_name = directory.name
-        
         # Check if the directory name contains the session prefix
         if SESSION_PREFIX not in dir_name:
             return False
@@ -355,14 +481,13 @@ class BeautifulCLI:
         """Scan directories with beautiful progress."""
         self.console.print("\n[bold]Analyzing Folders[/bold]")
         
-        recommendations = []
-        
         with Progress(
             SpinnerColumn(style="blue"),
             TextColumn("[progress.description]{task.description}"),
             BarColumn(complete_style="blue", finished_style="green"),
             console=self.console,
-            transient=True
+            transient=True,
+            refresh_per_second=_PROGRESS_REFRESH_HZ
         ) as progress:
             
             task = progress.add_task(
@@ -370,16 +495,25 @@ class BeautifulCLI:
                 total=len(directories)
             )
             
-            for directory in directories:
-                score = self.scanner.scan_directory(directory)
-                recommendations.append(score)
-                progress.advance(task)
+            def scores():
+                for directory in directories:
+                    yield self.scanner.scan_directory(directory)
+                    progress.advance(task)
+            
+            # Scores stream straight into the top-10 heap
+            recommendations = self._rank_recommendations(scores())
         
-        # Filter and sort
-        filtered = [r for r in recommendations if r.total_files >= 10]
-        sorted_recs = sorted(filtered, key=lambda x: x.score, reverse=True)
+        self.scanner.save_cache()
         
-        return sorted_recs[:10]
+        return recommendations
+    
+    def _rank_recommendations(self, scores: Iterable[DirectoryScore]) -> List[DirectoryScore]:
+        """Filter out folders with too few files and keep the 10 messiest."""
+        return heapq.nlargest(
+            10,
+            (r for r in scores if r.total_files >= MIN_FILES_FOR_RECOMMENDATION),
+            key=attrgetter("score"),
+        )
     
     def _show_no_recommendations(self):
         """Show message when no folders need organization."""
@@ -397,29 +531,15 @@ class BeautifulCLI:
         self.console.print("\n[bold]Recommendations[/bold]")
         self.console.print("[dim]Folders that need organization[/dim]\n")
         
-        table = Table(
-            show_header=True,
-            header_style="bold",
-            border_style="dim",
-            box=box.SIMPLE,
-            padding=(0, 1)
-        )
-        
-        table.add_column("#", style="dim", width=3)
-        table.add_column("Folder", style="cyan", overflow="fold")
-        table.add_column("Files", justify="right", style="blue")
-        table.add_column("Types", justify="right", style="magenta")
-        table.add_column("Size", justify="right", style="yellow")
-        table.add_column("Score", justify="right")
+        table = self._make_recs_table()
         
-        home = Path.home()
         for i, rec in enumerate(recommendations, 1):
             # Score with emoji
             score_display = self._score_emoji(rec.score)
             
             # Display relative path from home or absolute path
             try:
-                display_path = f"~/{rec.path.relative_to(home)}"
+                display_path = f"~/{rec.path.relative_to(_HOME)}"
             except ValueError:
                 # Not relative to home, use absolute path
                 display_path = str(rec.path)
@@ -427,7 +547,7 @@ class BeautifulCLI:
             table.add_row(
                 str(i),
                 display_path,
-                str(rec.total_files),
+                rec.files_formatted,
                 str(rec.file_types),
                 rec.size_formatted,
                 score_display
@@ -436,6 +556,34 @@ class BeautifulCLI:
         self.console.print(table)
         self.console.print()
     
+    def _make_recs_table(self) -> Table:
+        """
+        Create an empty recommendations table.
+        
+        Every column but Folder has a fixed width and doesn't wrap, so Rich
+        only has to measure the folder paths when laying the table out.
+        """
+        table = Table(
+            show_header=True,
+            header_style="bold",
+            border_style="dim",
+            box=box.SIMPLE,
+            padding=(0, 1),
+            show_lines=False,
+            expand=False,
+            collapse_padding=True,
+            pad_edge=False
+        )
+        
+        table.add_column("#", style="dim", width=3, no_wrap=True)
+        table.add_column("Folder", style="cyan", overflow="fold")
+        table.add_column("Files", justify="right", style="blue", width=8, no_wrap=True)
+        table.add_column("Types", justify="right", style="magenta", width=5, no_wrap=True)
+        table.add_column("Size", justify="right", style="yellow", width=10, no_wrap=True)
+        table.add_column("Score", justify="right", width=11, no_wrap=True)
+        
+        return table
+    
     def _score_emoji(self, score: float) -> str:
         """Get emoji representation of score."""
         if score >= 8:
@@ -481,16 +629,22 @@ class BeautifulCLI:
             SpinnerColumn(style="blue"),
             TextColumn("[progress.description]{task.description}"),
             console=self.console,
-            transient=True
+            transient=True,
+            refresh_per_second=_PROGRESS_REFRESH_HZ
         ) as progress:
             
             task = progress.add_task("Classifying files...", total=None)
-            # Use the same recursive setting as the scanner for consistency
-            # This ensures what we scan matches what we classify
+            # Classify through the scanner's walk for consistency
+            # This ensures what we scan matches what we classify.
+            # Files are classified as the walk yields them, so the running
+            # count is shown while the total is still unknown
             all_files = []
             for directory in directories:
-                files = self.classifier.classify_directory(directory, recursive=self.scanner.recursive)
-                all_files.extend(files)
+                entries = self.scanner.iter_entries(directory)
+                for file_info in self.classifier.iter_classify_entries(entries):
+                    all_files.append(file_info)
+                    if len(all_files) % _PROGRESS_BATCH_SIZE == 0:
+                        progress.update(task, description=f"Classified {len(all_files):,} files...")
             progress.update(task, completed=True)
         
         self.console.print(f"[green]✓[/green] Found {len(all_files)} files\n")
@@ -502,7 +656,8 @@ class BeautifulCLI:
             SpinnerColumn(style="blue"),
             TextColumn("[progress.description]{task.description}"),
             console=self.console,
-            transient=True
+            transient=True,
+            refresh_per_second=_PROGRESS_REFRESH_HZ
         ) as progress:
             
             task = progress.add_task("Finding duplicates...", total=None)
@@ -556,13 +711,18 @@ class BeautifulCLI:
         category_table.add_column(justify="right", style="blue", width=10)
         category_table.add_column(justify="right", style="yellow")
         
-        files_by_category = session.files_by_category
-        for category, files in sorted(files_by_category.items()):
-            size = sum(f.size for f in files)
+        # Count and total every category in one pass over the files
+        category_counts = Counter()
+        category_sizes = Counter()
+        for f in session.files:
+            category_counts[f.category] += 1
+            category_sizes[f.category] += f.size
+        
+        for category in sorted(category_counts):
             category_table.add_row(
                 f"📂 {category.capitalize()}",
-                f"{len(files)} files",
-                format_file_size(size)
+                f"{category_counts[category]} files",
+                format_file_size(category_sizes[category])
             )
         
         self.console.print(category_table)
@@ -592,7 +752,8 @@ class BeautifulCLI:
             TextColumn("[progress.description]{task.description}"),
             BarColumn(complete_style="blue", finished_style="green"),
             TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
-            console=self.console
+            console=self.console,
+            auto_refresh=False
         ) as progress:
             
             task = progress.add_task("Moving files...", total=len(files))
@@ -600,24 +761,67 @@ class BeautifulCLI:
             # Create session directory
             create_directory_safe(live_session.archive_path)
             
-            # Move files
-            for file_info in live_session.files:
-                if file_info.status.value == "error":
-                    continue
-                
+            # Move files in parallel; moves into the same category folder are
+            # serialized so collision checks and renames can't interleave.
+            # Each file's category lock is looked up once, up front
+            archive_path = live_session.archive_path
+            category_dir = self._category_dir
+            category_locks = {}
+            jobs = []
+            for f in live_session.files:
+                if f.status.value != "error":
+                    category = category_dir(f, archive_path)
+                    lock = category_locks.get(category)
+                    if lock is None:
+                        lock = category_locks[category] = threading.Lock()
+                    jobs.append((f, lock))
+            
+            # Hot-loop attribute lookups are bound to locals
+            move_file = self.mover._move_file
+            update = progress.update
+            refresh = progress.refresh
+            monotonic = time.monotonic
+            
+            def move(file_info, lock):
+                with lock:
+                    move_file(file_info, archive_path)
+            
+            # Advance and redraw in batches rather than once per file
+            pending = 0
+            last_flush = monotonic()
+            with ThreadPoolExecutor(max_workers=_MOVE_WORKERS) as executor:
+                futures = {executor.submit(move, f, lock): f for f, lock in jobs}
                 try:
-                    self.mover._move_file(file_info, live_session.archive_path)
-                except Exception as e:
-                    logger.error(f"Error moving {file_info.path}: {e}")
-                
-                progress.advance(task)
+                    for future in as_completed(futures):
+                        error = future.exception()
+                        if error is not None:
+                            logger.error("Error moving %s: %s", futures[future].path, error)
+                        
+                        pending += 1
+                        now = monotonic()
+                        if pending >= _PROGRESS_BATCH_SIZE or now - last_flush > _PROGRESS_BATCH_INTERVAL:
+                            update(task, advance=pending)
+                            refresh()
+                            pending = 0
+                            last_flush = now
+                except BaseException:
+                    # On Ctrl-C, drop queued moves; otherwise leaving the
+                    # executor would wait for every remaining file to move.
+                    # Only the moves already running finish.
+                    for future in futures:
+                        future.cancel()
+                    raise
+            
+            progress.update(task, advance=pending)
+            progress.refresh()
         
         # Generate report
         with Progress(
             SpinnerColumn(style="blue"),
             TextColumn("[progress.description]{task.description}"),
             console=self.console,
-            transient=True
+            transient=True,
+            refresh_per_second=_PROGRESS_REFRESH_HZ
         ) as progress:
             
             task = progress.add_task("Generating report...", total=None)
@@ -640,6 +844,11 @@ class BeautifulCLI:
         
         return live_session
     
+    def _category_dir(self, file_info, archive_path: Path) -> Path:
+        """Get the category folder a file will be moved into."""
+        destination = file_info.destination or self.mover._get_destination_path(file_info, archive_path)
+        return destination.parent
+    
     def _show_success(self, session):
         """Show beautiful success message."""
         self.console.print()
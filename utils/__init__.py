@@ -5,14 +5,21 @@ Contains helper functions and utilities.
 
 from .helpers import (
     get_file_hash,
+    get_file_hashes,
+    get_file_digest,
+    get_file_digests,
+    clear_file_hash_cache,
     get_file_size,
+    get_file_size_from_entry,
     format_timestamp,
     safe_filename,
     ensure_unique_path,
     create_directory_safe,
     is_hidden_file,
+    is_hidden_name,
     is_system_directory,
     get_file_extension,
+    get_extension_name,
     format_file_size,
     truncate_string,
     pluralize,
@@ -22,14 +29,21 @@ from .helpers import (
 
 __all__ = [
     "get_file_hash",
+    "get_file_hashes",
+    "get_file_digest",
+    "get_file_digests",
+    "clear_file_hash_cache",
     "get_file_size",
+    "get_file_size_from_entry",
     "format_timestamp",
     "safe_filename",
     "ensure_unique_path",
     "create_directory_safe",
     "is_hidden_file",
+    "is_hidden_name",
     "is_system_directory",
     "get_file_extension",
+    "get_extension_name",
     "format_file_size",
     "truncate_string",
     "pluralize",
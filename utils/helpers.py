@@ -5,38 +5,245 @@ Contains helper functions used across the application.
 
 import hashlib
 import logging
+import mmap
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, List, Optional
 from datetime import datetime
 
+try:
+    import blake3
+except ImportError:  # Optional, falls back to BLAKE2b
+    blake3 = None
+
 logger = logging.getLogger(__name__)
 
+# Read size used when a file has to be hashed in chunks
+_HASH_BUFFER_SIZE = 1 << 20  # 1 MiB
+
+# hashlib's own read/update loop, Python 3.11+
+_file_digest = getattr(hashlib, "file_digest", None)
+
+# Timestamp format used for session names
+_DEFAULT_TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+
+# Shared by every handler installed by setup_logging
+_LOG_FORMATTER = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+_logging_configured = False
+
+# Units used by format_file_size, and the size of one of each in bytes
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+_SIZE_DIVISORS = tuple(1 << (10 * i) for i in range(len(_SIZE_UNITS)))
+
+# Runs of characters that are not allowed in filenames
+_INVALID_FILENAME_RE = re.compile(r'[<>:"/\\|?*]+')
+
 
-def get_file_hash(file_path: Path, algorithm: str = "sha256") -> Optional[str]:
+def get_file_hash(
+    file_path: Path, algorithm: str = "sha256", max_bytes: Optional[int] = None
+) -> Optional[str]:
     """
-    Calculate the hash of a file.
+    Calculate the hash of a file as a hexadecimal string.
+
+    For display and serialization; use get_file_digest() to compare or
+    store hashes.
 
     Args:
         file_path: Path to the file
-        algorithm: Hash algorithm (md5, sha1, sha256)
+        algorithm: Hash algorithm, as for get_file_digest()
+        max_bytes: Only hash this many leading bytes (None hashes the whole file)
 
     Returns:
         Hexadecimal hash string, or None if error
     """
-    try:
-        hash_obj = hashlib.new(algorithm)
+    digest = get_file_digest(file_path, algorithm, max_bytes)
+    return digest.hex() if digest is not None else None
 
-        with open(file_path, "rb") as f:
-            # Read in chunks for large files
-            for chunk in iter(lambda: f.read(8192), b""):
-                hash_obj.update(chunk)
 
-        return hash_obj.hexdigest()
+def get_file_digest(
+    file_path: Path, algorithm: str = "sha256", max_bytes: Optional[int] = None
+) -> Optional[bytes]:
+    """
+    Calculate the raw digest of a file.
+
+    Results are memoized by (path, mtime, size), so a file is only read
+    again after it changes. Call clear_file_hash_cache() to free memory.
+
+    Args:
+        file_path: Path to the file
+        algorithm: Hash algorithm (md5, sha1, sha256, blake2b, blake3). blake3
+            falls back to blake2b if the blake3 package is not installed.
+        max_bytes: Only hash this many leading bytes (None hashes the whole file)
+
+    Returns:
+        Digest bytes, or None if error
+    """
+    try:
+        st = os.stat(file_path)
+        return _digest_file(
+            os.fspath(file_path), st.st_mtime_ns, st.st_size, algorithm, max_bytes
+        )
     except Exception as e:
         logger.error(f"Error hashing file {file_path}: {e}")
         return None
 
 
+@lru_cache(maxsize=4096)
+def _digest_file(
+    path: str, mtime_ns: int, size: int, algorithm: str, max_bytes: Optional[int]
+) -> bytes:
+    """Hash a file's contents. mtime_ns and size only serve as cache keys."""
+    if algorithm == "blake3":
+        if blake3 is not None:
+            return _digest_file_blake3(path, max_bytes)
+        # Fastest hashlib algorithm in software on 64-bit platforms
+        algorithm = "blake2b"
+
+    if algorithm in ("sha1", "sha256"):
+        _check_sha_acceleration()
+
+    hash_obj = hashlib.new(algorithm)
+
+    with open(path, "rb") as f:
+        if max_bytes is not None:
+            hash_obj.update(f.read(max_bytes))
+            return hash_obj.digest()
+
+        # Map the whole file so hashlib digests it in one call without the GIL;
+        # empty files can't be mapped
+        if size > 0:
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    hash_obj.update(mm)
+                return hash_obj.digest()
+            except (OSError, ValueError):
+                pass  # Not mappable (e.g. special files), read in chunks
+
+        if _file_digest is not None:
+            return _file_digest(f, algorithm).digest()
+
+        # Reuse one buffer rather than allocating a bytes object per read
+        buf = bytearray(_HASH_BUFFER_SIZE)
+        view = memoryview(buf)
+        while n := f.readinto(buf):
+            hash_obj.update(view[:n])
+
+    return hash_obj.digest()
+
+
+@lru_cache(maxsize=None)
+def _check_sha_acceleration() -> bool:
+    """
+    Check whether hashlib's SHA-1/SHA-256 can use the CPU's SHA extensions.
+
+    Runs once. Logs a warning if the CPU has SHA extensions but hashlib is
+    not backed by an OpenSSL recent enough (1.1.1+) to use them, in which
+    case SHA hashing is several times slower than it could be.
+
+    Returns:
+        False if the SHA extensions are known to go unused, True otherwise
+    """
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8", errors="ignore") as f:
+            cpuinfo = f.read()
+    except OSError:
+        return True  # Can't tell on this platform
+
+    flags = set(cpuinfo.split())
+    if not flags & {"sha_ni", "sha1", "sha2"}:
+        return True  # No SHA extensions to use
+
+    try:
+        import _hashlib
+        import ssl
+
+        uses_openssl = isinstance(hashlib.new("sha256"), _hashlib.HASH)
+        openssl_ok = uses_openssl and ssl.OPENSSL_VERSION_INFO >= (1, 1, 1)
+    except ImportError:
+        openssl_ok = False
+
+    if not openssl_ok:
+        logger.warning(
+            "CPU supports SHA extensions but hashlib is not using a recent "
+            "OpenSSL; SHA hashing will be slow. Upgrade OpenSSL or set "
+            "HASH_ALGORITHM to blake3 or blake2b."
+        )
+
+    return openssl_ok
+
+
+def _digest_file_blake3(path: str, max_bytes: Optional[int]) -> bytes:
+    """Hash a file with BLAKE3, memory-mapping whole files and using all cores."""
+    hash_obj = blake3.blake3(max_threads=blake3.blake3.AUTO)
+
+    if max_bytes is not None:
+        with open(path, "rb") as f:
+            hash_obj.update(f.read(max_bytes))
+    else:
+        hash_obj.update_mmap(path)
+
+    return hash_obj.digest()
+
+
+def get_file_hashes(
+    file_paths: Iterable[Path],
+    algorithm: str = "sha256",
+    max_workers: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+) -> List[Optional[str]]:
+    """
+    Calculate the hashes of many files in parallel.
+
+    hashlib and blake3 release the GIL while hashing, so threads overlap
+    both disk reads and hashing.
+
+    Args:
+        file_paths: Paths to the files
+        algorithm: Hash algorithm, as for get_file_hash()
+        max_workers: Number of threads (None uses the CPU count)
+        max_bytes: Only hash this many leading bytes (None hashes whole files)
+
+    Returns:
+        Hexadecimal hashes in the same order as file_paths, None for files that failed
+    """
+    return [
+        digest.hex() if digest is not None else None
+        for digest in get_file_digests(file_paths, algorithm, max_workers, max_bytes)
+    ]
+
+
+def get_file_digests(
+    file_paths: Iterable[Path],
+    algorithm: str = "sha256",
+    max_workers: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+) -> List[Optional[bytes]]:
+    """
+    Calculate the raw digests of many files in parallel.
+
+    Args:
+        file_paths: Paths to the files
+        algorithm: Hash algorithm, as for get_file_digest()
+        max_workers: Number of threads (None uses the CPU count)
+        max_bytes: Only hash this many leading bytes (None hashes whole files)
+
+    Returns:
+        Digests in the same order as file_paths, None for files that failed
+    """
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+        return list(
+            executor.map(lambda path: get_file_digest(path, algorithm, max_bytes), file_paths)
+        )
+
+
+def clear_file_hash_cache():
+    """Drop memoized file hashes."""
+    _digest_file.cache_clear()
+
+
 def get_file_size(file_path: Path) -> int:
     """
     Get the size of a file in bytes.
@@ -48,13 +255,33 @@ def get_file_size(file_path: Path) -> int:
         File size in bytes, or 0 if error
     """
     try:
-        return file_path.stat().st_size
+        return os.stat(file_path).st_size
     except Exception as e:
         logger.error(f"Error getting size of {file_path}: {e}")
         return 0
 
 
-def format_timestamp(dt: datetime, format_str: str = "%Y%m%d_%H%M%S") -> str:
+def get_file_size_from_entry(entry: os.DirEntry) -> int:
+    """
+    Get the size of a file from a directory entry.
+
+    Uses the stat result the entry caches, so files listed with
+    os.scandir are not stat'ed a second time.
+
+    Args:
+        entry: Directory entry for the file
+
+    Returns:
+        File size in bytes, or 0 if error
+    """
+    try:
+        return entry.stat().st_size
+    except Exception as e:
+        logger.error("Error getting size of %s: %s", entry.path, e)
+        return 0
+
+
+def format_timestamp(dt: datetime, format_str: str = _DEFAULT_TIMESTAMP_FORMAT) -> str:
     """
     Format a datetime object as a string.
 
@@ -65,28 +292,32 @@ def format_timestamp(dt: datetime, format_str: str = "%Y%m%d_%H%M%S") -> str:
     Returns:
         Formatted datetime string
     """
-    return dt.strftime(format_str)
+    # The default format is used for every session name; plain integer
+    # formatting avoids strftime parsing the format string each time
+    if format_str == _DEFAULT_TIMESTAMP_FORMAT:
+        return (
+            f"{dt.year:04d}{dt.month:02d}{dt.day:02d}_"
+            f"{dt.hour:02d}{dt.minute:02d}{dt.second:02d}"
+        )
+    return format(dt, format_str)
 
 
+@lru_cache(maxsize=4096)
 def safe_filename(filename: str) -> str:
     """
     Make a filename safe by removing/replacing invalid characters.
 
+    Results are memoized since the same names recur across folders.
+
     Args:
         filename: Original filename
 
     Returns:
         Safe filename
     """
-    # Characters to replace
-    invalid_chars = '<>:"/\\|?*'
-
-    safe_name = filename
-    for char in invalid_chars:
-        safe_name = safe_name.replace(char, "_")
-
-    # Remove leading/trailing spaces and dots
-    safe_name = safe_name.strip(". ")
+    # Replace each run of invalid characters with a single "_", then
+    # remove leading/trailing spaces and dots
+    safe_name = _INVALID_FILENAME_RE.sub("_", filename).strip(". ")
 
     # Ensure it's not empty
     if not safe_name:
@@ -112,23 +343,26 @@ def ensure_unique_path(path: Path, suffix_format: str = "_{counter}") -> Path:
     stem = path.stem
     suffix = path.suffix
     parent = path.parent
-    counter = 1
-
-    while True:
-        new_stem = stem + suffix_format.format(counter=counter)
-        new_path = parent / f"{new_stem}{suffix}"
 
-        if not new_path.exists():
-            return new_path
+    # Read the folder once and check names in memory instead of a stat per
+    # counter. Names are casefolded so case-insensitive filesystems can't
+    # report a "free" name that is actually taken.
+    try:
+        with os.scandir(parent) as it:
+            existing = {entry.name.casefold() for entry in it}
+    except OSError:
+        existing = set()
 
-        counter += 1
+    # The lowest free counter wins, so gaps left by deleted copies are reused
+    for counter in range(1, 10000):
+        new_name = f"{stem}{suffix_format.format(counter=counter)}{suffix}"
+        if new_name.casefold() not in existing:
+            return parent / new_name
 
-        # Safety check to avoid infinite loops
-        if counter > 9999:
-            # Add timestamp to make it unique
-            timestamp = format_timestamp(datetime.now())
-            new_stem = f"{stem}_{timestamp}"
-            return parent / f"{new_stem}{suffix}"
+    # Safety check to avoid infinite loops: add timestamp to make it unique
+    timestamp = format_timestamp(datetime.now())
+    new_stem = f"{stem}_{timestamp}"
+    return parent / f"{new_stem}{suffix}"
 
 
 def create_directory_safe(path: Path) -> bool:
@@ -159,7 +393,22 @@ def is_hidden_file(path: Path) -> bool:
     Returns:
         True if hidden, False otherwise
     """
-    return path.name.startswith(".")
+    return is_hidden_name(path.name)
+
+
+def is_hidden_name(name: str) -> bool:
+    """
+    Check if a file or directory name is hidden.
+
+    Takes the bare name (e.g. DirEntry.name), so no Path is needed.
+
+    Args:
+        name: File or directory name
+
+    Returns:
+        True if hidden, False otherwise
+    """
+    return name.startswith(".")
 
 
 def is_system_directory(path: Path, system_dirs: set) -> bool:
@@ -186,14 +435,36 @@ def get_file_extension(path: Path) -> str:
     Returns:
         Extension without dot, or empty string if no extension
     """
-    suffix = path.suffix.lstrip(".")
-    return suffix.lower()
+    return get_extension_name(path.name)
+
+
+def get_extension_name(name: str) -> str:
+    """
+    Get the extension of a file name without the dot.
 
+    Takes the bare name (e.g. DirEntry.name), so no Path is needed. Follows
+    Path.suffix: a leading dot, as in ".bashrc", doesn't start an extension.
 
+    Args:
+        name: File name
+
+    Returns:
+        Lowercase extension without dot, or empty string if no extension
+    """
+    i = name.rfind(".")
+    if i < 1:
+        return ""
+    return name[i + 1:].lower()
+
+
+@lru_cache(maxsize=4096)
 def format_file_size(size_bytes: int) -> str:
     """
     Format a file size in bytes to human-readable format.
 
+    Results are memoized since reports and previews format the same
+    totals repeatedly.
+
     Args:
         size_bytes: Size in bytes
 
@@ -202,12 +473,10 @@ def format_file_size(size_bytes: int) -> str:
     """
     if size_bytes < 1024:
         return f"{size_bytes} B"
-    elif size_bytes < 1024 * 1024:
-        return f"{size_bytes / 1024:.1f} KB"
-    elif size_bytes < 1024 * 1024 * 1024:
-        return f"{size_bytes / (1024 * 1024):.1f} MB"
-    else:
-        return f"{size_bytes / (1024 * 1024 * 1024):.1f} GB"
+
+    # Each unit spans 10 bits, so the bit length picks the unit directly
+    unit = min((int(size_bytes).bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size_bytes / _SIZE_DIVISORS[unit]:.1f} {_SIZE_UNITS[unit]}"
 
 
 def truncate_string(text: str, max_length: int = 50, suffix: str = "...") -> str:
@@ -223,8 +492,9 @@ def truncate_string(text: str, max_length: int = 50, suffix: str = "...") -> str
         Truncated string
     """
     if len(text) <= max_length:
-        return text
-    return text[: max_length - len(suffix)] + suffix
+        return text  # Common case: the original object, no copy
+    cut = max_length - len(suffix)
+    return f"{text[:cut]}{suffix}"
 
 
 def pluralize(count: int, singular: str, plural: Optional[str] = None) -> str:
@@ -266,8 +536,9 @@ def validate_directory(path: Path) -> tuple[bool, Optional[str]]:
         return False, f"Path must be absolute: {path}"
 
     try:
-        # Try to list directory to check read permissions
-        list(path.iterdir())
+        # Read one entry to check read permissions without listing everything
+        with os.scandir(path) as it:
+            next(it, None)
         return True, None
     except PermissionError:
         return False, f"Permission denied: {path}"
@@ -279,19 +550,30 @@ def setup_logging(level: str = "INFO", log_file: Optional[Path] = None):
     """
     Setup logging configuration.
 
+    Handlers are only installed on the first call; later calls just update
+    the level, so records are never formatted and written more than once.
+
     Args:
         level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_file: Optional log file path
     """
+    global _logging_configured
+
     numeric_level = getattr(logging, level.upper(), logging.INFO)
+    root = logging.getLogger()
+    root.setLevel(numeric_level)
+
+    if _logging_configured:
+        return
 
-    handlers = [logging.StreamHandler()]
+    handlers: List[logging.Handler] = [logging.StreamHandler()]
 
     if log_file:
-        handlers.append(logging.FileHandler(log_file))
+        # Don't create the file until something is logged
+        handlers.append(logging.FileHandler(log_file, delay=True))
+
+    for handler in handlers:
+        handler.setFormatter(_LOG_FORMATTER)
+        root.addHandler(handler)
 
-    logging.basicConfig(
-        level=numeric_level,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=handlers,
-    )
+    _logging_configured = True